@@ -0,0 +1,61 @@
+import logging
+import time
+from typing import Optional, Tuple
+
+from bs4 import BeautifulSoup
+import trafilatura
+
+# Kept outside the tools package on purpose: extraction worker processes import only this module,
+# trafilatura and BeautifulSoup, not the search tools and their API clients.
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+_WARM_UP_HTML = "<html><head><title>warm up</title></head><body><article><p>Warm up page.</p></article></body></html>"
+
+
+def extract_with_trafilatura(html_content: str) -> Optional[str]:
+    """Extract content using trafilatura library."""
+    try:
+        extracted_text = trafilatura.extract(html_content)
+        return extracted_text
+    except Exception as e:
+        logger.error(f"Trafilatura extraction failed: {e}")
+        return None
+
+
+def extract_with_beautifulsoup(html_content: str) -> Optional[str]:
+    """Extract content using BeautifulSoup as fallback."""
+    try:
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        # Remove unwanted elements
+        for element in soup(['script', 'style', 'header', 'footer', 'nav']):
+            element.decompose()
+
+        # Get text content
+        text = soup.body.get_text(separator='\n', strip=True) if soup.body else None
+        return text
+    except Exception as e:
+        logger.error(f"BeautifulSoup extraction failed: {e}")
+        return None
+
+
+def extract_text(html_content: str) -> Optional[str]:
+    """Extract clean text from HTML, trying trafilatura first and falling back to BeautifulSoup."""
+    content = extract_with_trafilatura(html_content)
+    if not content:
+        content = extract_with_beautifulsoup(html_content)
+    return content
+
+
+def warm_up():
+    """Worker initializer: run trafilatura and BeautifulSoup once so the first real page is fast."""
+    extract_text(_WARM_UP_HTML)
+
+
+def extract_timed(html_content: str) -> Tuple[Optional[str], float]:
+    """Extract text and return it with the extraction time in milliseconds."""
+    started = time.perf_counter()
+    content = extract_text(html_content)
+    return content, (time.perf_counter() - started) * 1000
@@ -0,0 +1,123 @@
+import json
+import logging
+import math
+import os
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPILL_THRESHOLD = 500
+DEFAULT_SPILL_DIR = "tmp/job_spill"
+RECENT_TITLES = 5
+
+
+@dataclass(slots=True)
+class JobRecord:
+    title: str
+    description: str
+    url: str
+    relevancy_score: Optional[float] = None
+
+
+class JobStore:
+    """
+    Columnar, memory-bounded store for the jobs saved during one agent run.
+
+    Jobs are kept as parallel columns (lists for text, float arrays for scores, NaN meaning
+    "not scored", and for the time each job was saved) instead of one dict per job. Once more
+    than `spill_threshold` jobs are held in memory they are appended to a JSON-lines file and
+    the in-memory columns are cleared, so memory stays bounded however large the run gets.
+
+    The spill file belongs to the store: whoever ends up holding the store must call `close()`
+    once the jobs have been read.
+
+    Args:
+        run_id (str): Identifier used to name the spill file
+        spill_threshold (int): Maximum number of jobs held in memory before spilling to disk
+        spill_dir (str): Directory for spill files
+    """
+
+    COLUMNS = ("title", "description", "url", "relevancy_score", "saved_at")
+
+    def __init__(self, run_id: str, spill_threshold: int = DEFAULT_SPILL_THRESHOLD,
+                 spill_dir: str = DEFAULT_SPILL_DIR):
+        self.spill_threshold = spill_threshold
+        self.spill_path = Path(spill_dir) / f"{run_id}.jsonl"
+        self._titles: List[str] = []
+        self._descriptions: List[str] = []
+        self._urls: List[str] = []
+        self._scores = array("d")
+        self._saved_at = array("d")
+        self._spilled = 0
+        self._recent_titles = deque(maxlen=RECENT_TITLES)
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._titles)
+
+    def append(self, record: JobRecord):
+        self._titles.append(record.title)
+        self._recent_titles.append(record.title)
+        self._descriptions.append(record.description)
+        self._urls.append(record.url)
+        self._scores.append(math.nan if record.relevancy_score is None else record.relevancy_score)
+        self._saved_at.append(time.time())
+        if len(self._titles) > self.spill_threshold:
+            self._spill()
+
+    def _spill(self):
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for row in zip(self._titles, self._descriptions, self._urls, self._scores, self._saved_at):
+                f.write(json.dumps(row) + "\n")
+        logger.info(f"Spilled {len(self._titles)} jobs to {self.spill_path}")
+        self._spilled += len(self._titles)
+        self._titles, self._descriptions, self._urls = [], [], []
+        self._scores = array("d")
+        self._saved_at = array("d")
+
+    def columns(self) -> Dict[str, object]:
+        """
+        Returns all jobs as columns, ready for ``pandas.DataFrame(store.columns())``.
+
+        Spilled jobs are read back first so the original insertion order is preserved.
+        """
+        if not self._spilled:
+            return dict(zip(self.COLUMNS, (self._titles, self._descriptions, self._urls, self._scores,
+                                           self._saved_at)))
+
+        titles, descriptions, urls, scores, saved_at = [], [], [], array("d"), array("d")
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                title, description, url, score, saved = json.loads(line)
+                titles.append(title)
+                descriptions.append(description)
+                urls.append(url)
+                # json writes NaN as the NaN literal and reads it back as float("nan").
+                scores.append(score)
+                saved_at.append(saved)
+        titles.extend(self._titles)
+        descriptions.extend(self._descriptions)
+        urls.extend(self._urls)
+        scores.extend(self._scores)
+        saved_at.extend(self._saved_at)
+        return dict(zip(self.COLUMNS, (titles, descriptions, urls, scores, saved_at)))
+
+    def last_titles(self) -> List[str]:
+        """Titles of the most recently saved jobs, including ones already spilled to disk."""
+        return list(self._recent_titles)
+
+    def summary(self) -> str:
+        if self._spilled:
+            return f"{len(self)} jobs ({self._spilled} spilled to {self.spill_path})"
+        return f"{len(self)} jobs"
+
+    def close(self):
+        """Removes the spill file once the jobs are no longer needed. Safe to call more than once."""
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
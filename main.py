@@ -3,9 +3,13 @@ from agno.debug import enable_debug_mode
 from agno.models.openai import OpenAIChat
 from agno.storage.sqlite import SqliteStorage
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+import time
+from typing import Dict, List
 from uuid import uuid4
-from tools import save_to_csv, extract_content, tavily_search, google_search
+from tools import (save_to_csv, extract_content, tavily_search, google_search, score_jobs, JobPosting,
+                   search_local_jobs, start_periodic_refresh)
+from job_store import JobRecord, JobStore
+from run_history import RunRecord, candidate_id, get_run_history
 
 enable_debug_mode()
 import logging
@@ -41,18 +45,27 @@ If you encounter any issues with a tool, report the error immediately without pr
 """
 
 
-class SingleJob(BaseModel):
-    title: str = Field(description="Title of the job")
-    description: str = Field(description="Brief Description of the Job")
-    url: str = Field(description="Url where the job was found")
+# Job stores of the runs in progress, keyed by session id. They live outside session_state because
+# session_state is serialized into the agent storage after every run.
+_job_stores: Dict[str, JobStore] = {}
+
+
+def _job_store(agent: Agent) -> JobStore:
+    return _job_stores[agent.session_id]
+
+
+def _save_job(agent: Agent, record: JobRecord):
+    store = _job_store(agent)
+    store.append(record)
+    agent.session_state["jobs_count"] = len(store)
 
 
 def save_found_jobs(agent: Agent, title: str, description: str, url: str):
     """
-        Saves a job to the agent's session state list and returns a confirmation message.
+        Saves a job to the run's job store and returns a confirmation message.
 
-        This function appends a JobState item to the 'jobs_list' maintained in the agent's session state
-        and provides feedback about the current state of the jobs list after the addition.
+        This function appends a JobRecord to the columnar job store of the current run and updates
+        the 'jobs_count' kept in the agent's session state.
 
         Args:
             agent (Agent): The agent instance containing the session state.
@@ -61,33 +74,106 @@ def save_found_jobs(agent: Agent, title: str, description: str, url: str):
             url: Url where the job is found
 
         Returns:
-            str: A message confirming the current state of the jobs list after adding the new item.
+            str: A message confirming the job was saved and the number of jobs saved so far.
 
         Note:
-            The function assumes that agent.session_state["jobs_list"] is already initialized
-            as a list before this function is called.
+            The function assumes a JobStore was registered for agent.session_id before the run started.
         """
     try:
         logger.info(f"save_found_jobs called with title: {title}, url: {url}")
-        logger.debug(f"Current session state before adding job: {agent.session_state}")
+        _save_job(agent, JobRecord(title=title, description=description, url=url))
+        store = _job_store(agent)
+        logger.info(f"Job added successfully. Job title: {title}. Store now holds {store.summary()}")
+
+        return f"Job '{title}' added successfully. {len(store)} jobs saved so far, latest: {store.last_titles()}"
+    except Exception as e:
+        error_msg = f"Error in save_found_jobs: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return error_msg
+
+
+def score_and_save_jobs(agent: Agent, jobs: List[dict]):
+    """
+        Scores many job postings against the candidate's resume in a few batched requests
+        and saves all of them to the run's job store.
+
+        Prefer this tool over calling save_found_jobs once per job when you have found several postings.
+        Only pass urls and titles: the text of pages opened with extract_content is reused, and other
+        pages are fetched automatically.
+
+        Args:
+            agent (Agent): The agent instance containing the session state.
+            jobs: List of jobs, each a dict with keys:
+                * url: Url where the job is found
+                * title: Title of the job, if known
 
-        single_job = SingleJob(title=title, description=description, url=url)
-        job_data = single_job.model_dump()
+        Returns:
+            str: A message with the number of saved jobs and their relevancy scores.
+        """
+    try:
+        logger.info(f"score_and_save_jobs called with {len(jobs)} jobs")
+        job_postings = [JobPosting(url=job["url"], title=job.get("title") or "") for job in jobs]
+        scored_jobs = score_jobs(agent.session_state["resume"], job_postings)
 
-        agent.session_state["jobs_list"].append(job_data)
-        logger.info(f"Job added successfully. Job title: {title}")
-        logger.debug(f"Current session state after adding job: {agent.session_state}")
+        for job in scored_jobs:
+            _save_job(agent, JobRecord(title=job.job_title, description=job.description, url=job.job_url,
+                                       relevancy_score=job.relevancy_score))
 
-        return f"Job '{title}' added successfully. The job list now is {agent.session_state['jobs_list']}"
+        summary = ", ".join(f"'{job.job_title}' ({job.relevancy_score:.2f})" for job in scored_jobs)
+        logger.info(f"Saved {len(scored_jobs)} scored jobs. Store now holds {_job_store(agent).summary()}")
+        return f"Saved {len(scored_jobs)} of {len(jobs)} jobs: {summary}"
     except Exception as e:
-        error_msg = f"Error in save_found_jobs: {str(e)}"
+        error_msg = f"Error in score_and_save_jobs: {str(e)}"
         logger.error(error_msg, exc_info=True)
         return error_msg
 
 
+SEARCH_TOOL_NAMES = ("search_local_jobs", "tavily_search", "google_search")
+MODEL_ID = "gpt-4o"
+
+
+def _search_queries(response) -> List[str]:
+    """Collects the queries the agent passed to the search tools during a run."""
+    queries = []
+    for tool in getattr(response, "tools", None) or []:
+        if tool.get("tool_name") in SEARCH_TOOL_NAMES:
+            query = (tool.get("tool_args") or {}).get("query")
+            if query:
+                queries.append(query)
+    return queries
+
+
+def _record_run(agent: Agent, response, job_store: JobStore, resume: str, user_prompt: str,
+                started_at: float, status: str):
+    """Writes the run's metadata and saved jobs to the run history; failures are logged, not raised."""
+    try:
+        metrics = getattr(agent, "session_metrics", None)
+        run = RunRecord(
+            run_id=agent.session_id,
+            candidate_id=candidate_id(resume),
+            started_at=started_at,
+            finished_at=time.time(),
+            status=status,
+            model=MODEL_ID,
+            instructions=user_prompt,
+            queries=_search_queries(response),
+            input_tokens=getattr(metrics, "input_tokens", None),
+            output_tokens=getattr(metrics, "output_tokens", None),
+            total_tokens=getattr(metrics, "total_tokens", None),
+        )
+        get_run_history().record_run(run, job_store.columns())
+    except Exception as e:
+        logger.error(f"Failed to record run history: {str(e)}", exc_info=True)
 
 
 def call_agent_and_return_state(resume:str, user_prompt: str):
+    """
+    Runs the job search agent and returns its session state plus the run's saved jobs.
+
+    The returned state holds the run's JobStore under "jobs_store". The caller owns it and must call
+    its close() once the jobs are read, which removes any spill file. If the run raises, the store
+    is closed here.
+    """
     final_prompt = f"""
     # CANDIDATE RESUME
     ```
@@ -103,11 +189,16 @@ def call_agent_and_return_state(resume:str, user_prompt: str):
     Then formulate effective search queries based on both the resume and job search requirements.
     Use boolean operators in your search queries when appropriate to find the most relevant results.
     """
+    # Keeps the local job index fresh in the background; a no-op without a feeds file or when already running.
+    start_periodic_refresh()
+    session_id = str(uuid4())
+    job_store = JobStore(run_id=session_id)
+    _job_stores[session_id] = job_store
     agent = Agent(
-        model=OpenAIChat(id="gpt-4o"),
-        session_state={"jobs_list": []},
+        model=OpenAIChat(id=MODEL_ID),
+        session_state={"jobs_count": 0, "resume": resume},
         delay_between_retries=5,
-        session_id=str(uuid4()),
+        session_id=session_id,
         add_state_in_messages=True,
         reasoning=True,
         description=prompt,
@@ -135,7 +226,8 @@ def call_agent_and_return_state(resume:str, user_prompt: str):
                      - Prioritize search terms that match the candidate's strongest skills and experience
 
                      STEP 3: SEARCH FOR RELEVANT JOBS
-                     - Use the search tools (tavily_search or google_search) to find relevant job postings
+                     - Start with search_local_jobs, which searches postings already pulled from company career feeds
+                     - Use the web search tools (tavily_search or google_search) when the local index has too few matches
                      - Focus on recent job postings from the last week only
                      - Use extract_content tool to get detailed information from job posting pages
                      - Prioritize company career pages and LinkedIn over general job boards
@@ -148,6 +240,9 @@ def call_agent_and_return_state(resume:str, user_prompt: str):
                        * url: The URL where the job was found
                      - You MUST call save_found_jobs at least once before completing your task
                      - Do not end your search until you have found and saved at least one job
+                     - When you have found several postings, save them all at once with the
+                       score_and_save_jobs tool instead; it scores every posting against the resume
+                       and saves it. Pass only a list of items with a "url" and a "title" key, never the page content
 
                      Example of using the save_found_jobs tool:
                      save_found_jobs(
@@ -156,11 +251,22 @@ def call_agent_and_return_state(resume:str, user_prompt: str):
                          url="https://example.com/jobs/123"
                      )
                      """,
-        tools=[save_found_jobs, extract_content, tavily_search, google_search],
+        tools=[save_found_jobs, score_and_save_jobs, extract_content, search_local_jobs, tavily_search, google_search],
         storage=SqliteStorage(table_name="agent_sessions", db_file="tmp/data.db"),
         show_tool_calls=True,
         markdown=True,
         debug_mode=True,
     )
-    agent.run(final_prompt)
-    return agent.session_state
+    started_at = time.time()
+    response = None
+    status = "error"
+    try:
+        response = agent.run(final_prompt)
+        status = "success"
+    finally:
+        _job_stores.pop(session_id, None)
+        _record_run(agent, response, job_store, resume, user_prompt, started_at, status)
+        if status != "success":
+            job_store.close()
+    logger.info(f"Agent run {session_id} finished with {job_store.summary()}")
+    return {**agent.session_state, "jobs_store": job_store}
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+HISTORY_DB_FILE = "tmp/run_history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    duration_s REAL NOT NULL,
+    status TEXT NOT NULL,
+    model TEXT,
+    instructions TEXT,
+    queries TEXT NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    total_tokens INTEGER,
+    job_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_candidate_idx ON runs(candidate_id, started_at);
+CREATE TABLE IF NOT EXISTS run_jobs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    candidate_id TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    url TEXT NOT NULL,
+    relevancy_score REAL
+);
+CREATE INDEX IF NOT EXISTS run_jobs_candidate_idx ON run_jobs(candidate_id, saved_at);
+CREATE INDEX IF NOT EXISTS run_jobs_run_idx ON run_jobs(run_id);
+CREATE INDEX IF NOT EXISTS run_jobs_url_idx ON run_jobs(url);
+"""
+
+
+class RunRecord(BaseModel):
+    run_id: str
+    candidate_id: str
+    started_at: float
+    finished_at: float
+    status: str = Field(description="'success' or 'error'")
+    model: Optional[str] = None
+    instructions: Optional[str] = None
+    queries: List[str] = []
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+
+
+def candidate_id(resume: str) -> str:
+    """Stable identifier for a resume, so runs for the same candidate can be grouped without storing the resume."""
+    normalized = " ".join(resume.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class RunHistory:
+    """
+    Indexed SQLite tables holding every run's metadata and the jobs it saved.
+
+    Reads are paginated with LIMIT/OFFSET over indexed columns, so the UI never has to
+    deserialize whole agent sessions to show history.
+    """
+
+    def __init__(self, db_file: str = HISTORY_DB_FILE):
+        self.db_file = db_file
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record_run(self, run: RunRecord, jobs: Dict[str, object]):
+        """
+        Stores a run and its saved jobs in one transaction.
+
+        Args:
+            run (RunRecord): Run metadata
+            jobs: Job columns as returned by ``JobStore.columns()``; each job keeps the time it was saved
+        """
+        rows = [
+            (run.run_id, run.candidate_id, saved_at, title, description, url,
+             None if score is None or math.isnan(score) else score)
+            for title, description, url, score, saved_at in zip(jobs["title"], jobs["description"], jobs["url"],
+                                                                jobs["relevancy_score"], jobs["saved_at"])
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs(run_id, candidate_id, started_at, finished_at, duration_s, status, model, "
+                "instructions, queries, input_tokens, output_tokens, total_tokens, job_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run.run_id, run.candidate_id, run.started_at, run.finished_at, run.finished_at - run.started_at,
+                 run.status, run.model, run.instructions, json.dumps(run.queries), run.input_tokens,
+                 run.output_tokens, run.total_tokens, len(rows)),
+            )
+            conn.execute("DELETE FROM run_jobs WHERE run_id = ?", (run.run_id,))
+            conn.executemany(
+                "INSERT INTO run_jobs(run_id, candidate_id, saved_at, title, description, url, relevancy_score) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Recorded run {run.run_id} with {len(rows)} jobs in run history")
+
+    @staticmethod
+    def _job_filter(candidate: Optional[str], since_days: Optional[float], run_id: Optional[str]):
+        clauses, params = [], []
+        if candidate:
+            clauses.append("candidate_id = ?")
+            params.append(candidate)
+        if since_days is not None:
+            clauses.append("saved_at >= ?")
+            params.append(time.time() - since_days * 24 * 60 * 60)
+        if run_id:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count_jobs(self, candidate: Optional[str] = None, since_days: Optional[float] = None,
+                   run_id: Optional[str] = None) -> int:
+        where, params = self._job_filter(candidate, since_days, run_id)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM run_jobs{where}", params).fetchone()[0]
+
+    def query_jobs(self, candidate: Optional[str] = None, since_days: Optional[float] = None,
+                   run_id: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[dict]:
+        """
+        Saved jobs, newest first, e.g. all jobs found for a candidate in the last 30 days:
+        ``query_jobs(candidate=candidate_id(resume), since_days=30)``.
+        """
+        where, params = self._job_filter(candidate, since_days, run_id)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT run_id, saved_at, title, description, url, relevancy_score FROM run_jobs{where} "
+                "ORDER BY saved_at DESC, id LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_runs(self, candidate: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[dict]:
+        where, params = ("WHERE candidate_id = ? ", [candidate]) if candidate else ("", [])
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM runs {where}ORDER BY started_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        runs = [dict(row) for row in rows]
+        for run in runs:
+            run["queries"] = json.loads(run["queries"])
+        return runs
+
+    def compare_runs(self, run_a: str, run_b: str) -> Dict[str, List[dict]]:
+        """
+        Compares the jobs of two runs by url.
+
+        Returns:
+            Dict[str, List[dict]]: 'only_a', 'only_b' and 'both' lists of jobs (the 'both' entries come from run_b)
+        """
+        with closing(self._connect()) as conn:
+            def jobs_of(run_id: str) -> Dict[str, dict]:
+                rows = conn.execute(
+                    "SELECT title, description, url, relevancy_score FROM run_jobs WHERE run_id = ? ORDER BY id",
+                    (run_id,),
+                ).fetchall()
+                return {row["url"]: dict(row) for row in rows}
+
+            jobs_a, jobs_b = jobs_of(run_a), jobs_of(run_b)
+        return {
+            "only_a": [job for url, job in jobs_a.items() if url not in jobs_b],
+            "only_b": [job for url, job in jobs_b.items() if url not in jobs_a],
+            "both": [job for url, job in jobs_b.items() if url in jobs_a],
+        }
+
+
+_history: Optional[RunHistory] = None
+
+
+def get_run_history() -> RunHistory:
+    global _history
+    if _history is None:
+        _history = RunHistory()
+    return _history
@@ -0,0 +1,8 @@
+import os
+
+# tools/__init__ builds the Google search wrapper at import time, which requires credentials.
+# The tests never call the search APIs, so placeholder values are enough.
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("GOOGLE_CSE_ID", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
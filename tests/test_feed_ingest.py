@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+
+from tools import extraction_pool
+from tools.crawler import FetchResult
+from tools.feed_ingest import GREENHOUSE_URL, LEVER_URL, FeedConfig, refresh_feed
+from tools.job_index import JobIndex
+
+FIXTURES = Path(__file__).parent / "fixtures" / "feeds"
+
+SITEMAP_URL = "https://careers.initech.com/sitemap.xml"
+DEVOPS_URL = "https://careers.initech.com/jobs/devops-engineer"
+FRONTEND_URL = "https://careers.initech.com/jobs/frontend-developer"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class ReplayFetch:
+    """Serves recorded responses by url and remembers every request made."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def __call__(self, url, headers):
+        self.calls.append((url, dict(headers)))
+        return self.responses[url]
+
+
+def _ok(url: str, fixture: str, headers=None) -> FetchResult:
+    return FetchResult(url=url, status="success", status_code=200, html=_fixture(fixture), headers=headers or {})
+
+
+@pytest.fixture
+def index(tmp_path):
+    return JobIndex(db_file=str(tmp_path / "jobs_index.db"))
+
+
+@pytest.fixture(autouse=True)
+def inline_extraction(monkeypatch):
+    # Extract sitemap pages on the test thread instead of spawning worker processes.
+    monkeypatch.setattr(extraction_pool, "EXTRACTION_WORKERS", 0)
+
+
+def test_greenhouse_feed_is_indexed_and_searchable(index):
+    feed = FeedConfig(type="greenhouse", board="acme", company="Acme")
+    url = GREENHOUSE_URL.format(board="acme")
+    fetch = ReplayFetch({url: _ok(url, "greenhouse_jobs.json")})
+
+    assert refresh_feed(feed, index, fetch) == {"upserted": 2, "deleted": 0}
+
+    results = index.search('"spring boot" java -"entry level"', limit=5)
+    assert [result["url"] for result in results] == ["https://boards.greenhouse.io/acme/jobs/4012345"]
+    assert results[0]["title"] == "Senior Java Developer"
+    assert "Acme | Remote - US" in results[0]["content"]
+    assert "Kafka and PostgreSQL" in results[0]["content"]
+
+
+def test_greenhouse_not_modified_sends_validators_and_keeps_jobs(index):
+    feed = FeedConfig(type="greenhouse", board="acme")
+    url = GREENHOUSE_URL.format(board="acme")
+    validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2026 14:15:00 GMT"}
+    refresh_feed(feed, index, ReplayFetch({url: _ok(url, "greenhouse_jobs.json", validators)}))
+
+    fetch = ReplayFetch({url: FetchResult(url=url, status="not_modified", status_code=304)})
+    assert refresh_feed(feed, index, fetch) == {"upserted": 0, "deleted": 0}
+
+    assert fetch.calls == [(url, {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Oct 2026 14:15:00 GMT"})]
+    assert len(index.job_versions(feed.name)) == 2
+
+
+def test_greenhouse_removed_postings_are_deleted(index):
+    feed = FeedConfig(type="greenhouse", board="acme")
+    url = GREENHOUSE_URL.format(board="acme")
+    refresh_feed(feed, index, ReplayFetch({url: _ok(url, "greenhouse_jobs.json")}))
+
+    counts = refresh_feed(feed, index, ReplayFetch({url: _ok(url, "greenhouse_jobs_one_removed.json")}))
+
+    # The remaining posting is unchanged, so it is not rewritten.
+    assert counts == {"upserted": 0, "deleted": 1}
+    assert list(index.job_versions(feed.name)) == ["greenhouse:acme:4012345"]
+    assert index.search("django", limit=5) == []
+
+
+def test_lever_feed_includes_list_sections(index):
+    feed = FeedConfig(type="lever", board="globex", company="Globex")
+    url = LEVER_URL.format(board="globex")
+
+    assert refresh_feed(feed, index, ReplayFetch({url: _ok(url, "lever_postings.json")})) == {"upserted": 2, "deleted": 0}
+
+    results = index.search("kubernetes mentor", limit=5)
+    assert [result["title"] for result in results] == ["Staff Backend Engineer"]
+    assert "Globex | Toronto, Canada" in results[0]["content"]
+    assert "Visa sponsorship available." in results[0]["content"]
+
+
+def test_sitemap_only_refetches_pages_whose_lastmod_changed(index):
+    feed = FeedConfig(type="sitemap", url=SITEMAP_URL, url_pattern="/jobs/", company="Initech")
+    pages = {
+        DEVOPS_URL: _ok(DEVOPS_URL, "devops_engineer.html"),
+        FRONTEND_URL: _ok(FRONTEND_URL, "frontend_developer.html"),
+    }
+
+    first = ReplayFetch({SITEMAP_URL: _ok(SITEMAP_URL, "sitemap.xml"), **pages})
+    assert refresh_feed(feed, index, first) == {"upserted": 2, "deleted": 0}
+    assert [url for url, _ in first.calls] == [SITEMAP_URL, DEVOPS_URL, FRONTEND_URL]
+    assert [result["title"] for result in index.search("terraform", limit=5)] == ["DevOps Engineer | Initech Careers"]
+
+    unchanged = ReplayFetch({SITEMAP_URL: _ok(SITEMAP_URL, "sitemap.xml"), **pages})
+    assert refresh_feed(feed, index, unchanged) == {"upserted": 0, "deleted": 0}
+    assert [url for url, _ in unchanged.calls] == [SITEMAP_URL]
+
+    updated = ReplayFetch({SITEMAP_URL: _ok(SITEMAP_URL, "sitemap_updated.xml"), **pages})
+    assert refresh_feed(feed, index, updated) == {"upserted": 1, "deleted": 0}
+    assert [url for url, _ in updated.calls] == [SITEMAP_URL, FRONTEND_URL]
+    assert len(index.job_versions(feed.name)) == 2
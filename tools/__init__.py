@@ -2,4 +2,7 @@ from .tavilysearchtool import tavily_search
 from .excel_saver_notinuse import save_jobs_to_csv
 from .excel_saver_plain import save_to_csv
 from .web_scraper import extract_content
-from .googlesearchtool import google_search
\ No newline at end of file
+from .googlesearchtool import google_search
+from .job_scorer import score_jobs, JobPosting
+from .job_index import search_local_jobs
+from .feed_ingest import refresh_feeds, start_periodic_refresh
@@ -0,0 +1,265 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "JobSearchAndMatcherAgent/0.1 (+https://github.com/radharamanaa/Job-Search-Agent)"
+DEFAULT_CRAWL_DELAY = 2.0
+ROBOTS_TTL_SECONDS = 24 * 60 * 60
+# Responses that mean the host wants us to slow down or go away.
+BACKOFF_STATUS_CODES = {403, 429, 503}
+BASE_BACKOFF_SECONDS = 60.0
+MAX_BACKOFF_SECONDS = 24 * 60 * 60
+# Longest a fetch waits for its turn in a domain's queue before giving up with 'deferred'.
+MAX_QUEUE_WAIT_SECONDS = 30.0
+
+
+class FetchResult(BaseModel):
+    url: str
+    status: str  # 'success', 'not_modified', 'error', 'disallowed', 'blocked' or 'deferred'
+    status_code: Optional[int] = None
+    html: Optional[str] = None
+    headers: Dict[str, str] = {}
+    error: Optional[str] = None
+
+
+def _retry_after_seconds(retry_after: Optional[str]) -> float:
+    """Parses a Retry-After header given either as seconds or as an HTTP date; 0 if absent or invalid."""
+    if not retry_after:
+        return 0.0
+    retry_after = retry_after.strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _DomainState:
+    """Per-domain FIFO queue, politeness timer and cached robots.txt."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.queue = deque()
+        self.active = 0
+        self.next_allowed_at = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_fetched_at = 0.0
+        self.robots_lock = threading.Lock()
+
+
+class PoliteCrawler:
+    """
+    Fetches pages while respecting robots.txt, crawl delays and per-domain concurrency limits.
+
+    Requests for the same domain are served in FIFO order, at most `max_per_domain` at a time
+    and no closer together than the domain's crawl delay. Domains answering 403, 429 or 503 are
+    put on a backoff list persisted to disk, so later runs skip them until the backoff expires
+    instead of burning retries.
+
+    A fetch that would wait longer than `max_wait` seconds for its turn (a large Crawl-delay or
+    a long queue for the domain) returns a 'deferred' result instead of stalling the caller.
+
+    Args:
+        max_per_domain (int): Maximum concurrent requests to a single domain
+        default_delay (float): Seconds between requests to a domain when robots.txt sets no Crawl-delay
+        backoff_file (str): JSON file holding the persistent block/backoff list
+        timeout (float): Request timeout in seconds
+        max_wait (float): Default longest wait in a domain's queue, in seconds
+    """
+
+    def __init__(self, max_per_domain: int = 1, default_delay: float = DEFAULT_CRAWL_DELAY,
+                 backoff_file: str = "tmp/crawler_backoff.json", timeout: float = 10,
+                 max_wait: float = MAX_QUEUE_WAIT_SECONDS):
+        self.max_per_domain = max_per_domain
+        self.max_wait = max_wait
+        self.default_delay = default_delay
+        self.timeout = timeout
+        self.backoff_path = Path(backoff_file)
+        self._domains: Dict[str, _DomainState] = {}
+        self._domains_lock = threading.Lock()
+        self._backoff_lock = threading.Lock()
+        self._backoff = self._load_backoff()
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": USER_AGENT})
+
+    def _load_backoff(self) -> Dict[str, dict]:
+        try:
+            with open(self.backoff_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backoff file {self.backoff_path}: {e}")
+            return {}
+
+    def _save_backoff(self):
+        self.backoff_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.backoff_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._backoff, f, indent=2)
+        tmp_path.replace(self.backoff_path)
+
+    def _domain(self, netloc: str) -> _DomainState:
+        with self._domains_lock:
+            if netloc not in self._domains:
+                self._domains[netloc] = _DomainState()
+            return self._domains[netloc]
+
+    def blocked_until(self, netloc: str) -> Optional[float]:
+        """Returns the timestamp until which a domain is backed off, or None if it may be fetched."""
+        with self._backoff_lock:
+            entry = self._backoff.get(netloc)
+            if entry and entry["until"] > time.time():
+                return entry["until"]
+            return None
+
+    def _record_failure(self, netloc: str, status_code: int, retry_after: Optional[str]):
+        with self._backoff_lock:
+            entry = self._backoff.get(netloc, {"failures": 0})
+            failures = entry["failures"] + 1
+            delay = min(BASE_BACKOFF_SECONDS * 2 ** (failures - 1), MAX_BACKOFF_SECONDS)
+            delay = min(max(delay, _retry_after_seconds(retry_after)), MAX_BACKOFF_SECONDS)
+            self._backoff[netloc] = {"failures": failures, "until": time.time() + delay, "status": status_code}
+            logger.warning(f"Backing off {netloc} for {delay:.0f}s after HTTP {status_code}")
+            self._save_backoff()
+
+    def _record_success(self, netloc: str):
+        with self._backoff_lock:
+            if self._backoff.pop(netloc, None) is not None:
+                self._save_backoff()
+
+    def _robots(self, scheme: str, netloc: str, state: _DomainState) -> RobotFileParser:
+        with state.robots_lock:
+            if state.robots is not None and time.time() - state.robots_fetched_at <= ROBOTS_TTL_SECONDS:
+                return state.robots
+            robots_url = f"{scheme}://{netloc}/robots.txt"
+            parser = RobotFileParser(robots_url)
+            try:
+                response = self._session.get(robots_url, timeout=self.timeout)
+            except requests.RequestException as e:
+                # RFC 9309: an unreachable robots.txt means complete disallow. Not cached, so it is retried.
+                logger.warning(f"Could not fetch {robots_url}, treating host as disallowed: {e}")
+                parser.disallow_all = True
+                return parser
+            if response.status_code == 429 or response.status_code >= 500:
+                # The host is overloaded or rate limiting us: back off and retry robots.txt afterwards.
+                self._record_failure(netloc, response.status_code, response.headers.get("Retry-After"))
+                parser.disallow_all = True
+                return parser
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+            state.robots = parser
+            state.robots_fetched_at = time.time()
+            return parser
+
+    def _crawl_delay(self, robots: RobotFileParser) -> float:
+        delay = robots.crawl_delay(USER_AGENT)
+        return float(delay) if delay is not None else self.default_delay
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+              max_wait: Optional[float] = None) -> FetchResult:
+        """
+        Fetch a page politely. Blocks until the domain's queue, delay and concurrency limit allow it.
+
+        Extra request headers (e.g. If-None-Match) can be passed; a 304 answer is reported as 'not_modified'.
+        If the turn would come later than `max_wait` seconds from now (default: the crawler's max_wait),
+        nothing is requested and a 'deferred' result is returned; pass math.inf to always wait.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        parsed = urlparse(url)
+        netloc = parsed.netloc.lower()
+        if self.blocked_until(netloc):
+            return FetchResult(url=url, status="blocked", error=f"Domain {netloc} is backed off")
+
+        state = self._domain(netloc)
+        robots = self._robots(parsed.scheme, netloc, state)
+        if self.blocked_until(netloc):
+            return FetchResult(url=url, status="blocked", error=f"Domain {netloc} is backed off")
+        if not robots.can_fetch(USER_AGENT, url):
+            logger.info(f"robots.txt disallows {url}")
+            return FetchResult(url=url, status="disallowed", error="Disallowed by robots.txt")
+        delay = self._crawl_delay(robots)
+
+        deferred = FetchResult(url=url, status="deferred",
+                               error=f"Waiting for {netloc} would take longer than {max_wait:.0f}s")
+        ticket = object()
+        with state.cond:
+            now = time.monotonic()
+            # Every request already queued is spaced at least `delay` apart from the next one.
+            if max(state.next_allowed_at - now, 0.0) + len(state.queue) * delay > max_wait:
+                logger.info(f"Deferring {url}: {netloc} queue is too long (crawl delay {delay:.0f}s)")
+                return deferred
+            deadline = now + max_wait
+            state.queue.append(ticket)
+            while True:
+                now = time.monotonic()
+                wait = state.next_allowed_at - now
+                if state.queue[0] is ticket and state.active < self.max_per_domain and wait <= 0:
+                    break
+                if now >= deadline:
+                    state.queue.remove(ticket)
+                    state.cond.notify_all()
+                    logger.info(f"Deferring {url}: waited {max_wait:.0f}s for {netloc}")
+                    return deferred
+                timeout = min(wait, deadline - now) if wait > 0 else deadline - now
+                state.cond.wait(timeout=None if math.isinf(timeout) else timeout)
+            state.queue.popleft()
+            state.active += 1
+            state.next_allowed_at = time.monotonic() + delay
+            state.cond.notify_all()
+
+        try:
+            # Another request may have tripped the backoff while we were queued.
+            if self.blocked_until(netloc):
+                return FetchResult(url=url, status="blocked", error=f"Domain {netloc} is backed off")
+            response = self._session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                self._record_success(netloc)
+                return FetchResult(url=url, status="not_modified", status_code=304, headers=dict(response.headers))
+            if response.status_code in BACKOFF_STATUS_CODES:
+                self._record_failure(netloc, response.status_code, response.headers.get("Retry-After"))
+                return FetchResult(url=url, status="error", status_code=response.status_code,
+                                   error=f"HTTP {response.status_code}")
+            response.raise_for_status()
+            self._record_success(netloc)
+            return FetchResult(url=url, status="success", status_code=response.status_code, html=response.text,
+                               headers=dict(response.headers))
+        except requests.RequestException as e:
+            logger.error(f"Error fetching page: {e}")
+            status_code = e.response.status_code if e.response is not None else None
+            return FetchResult(url=url, status="error", status_code=status_code, error=str(e))
+        finally:
+            with state.cond:
+                state.active -= 1
+                state.cond.notify_all()
+
+
+_crawler: Optional[PoliteCrawler] = None
+_crawler_lock = threading.Lock()
+
+
+def get_crawler() -> PoliteCrawler:
+    """Returns the process-wide crawler so every tool shares the same queues and backoff list."""
+    global _crawler
+    with _crawler_lock:
+        if _crawler is None:
+            _crawler = PoliteCrawler()
+        return _crawler
@@ -0,0 +1,123 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from pydantic import BaseModel
+
+import extraction_worker
+
+logger = logging.getLogger(__name__)
+
+# Number of extraction processes; 0 runs extraction inline on the calling thread.
+# One core is left for the agent, Streamlit and crawler threads.
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(max(1, (os.cpu_count() or 1) - 1))))
+# Longest a page may take from submission to result, including time waiting for a free slot.
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+
+
+class ExtractionResult(BaseModel):
+    content: Optional[str] = None
+    extraction_ms: float  # Time spent extracting inside the worker
+    queued_ms: float  # Time between submission and the result being available, minus extraction
+
+
+class ExtractionPool:
+    """
+    Runs CPU-bound HTML extraction in warm worker processes so it is not capped by the GIL.
+
+    Workers only import `extraction_worker` (trafilatura and BeautifulSoup), not the tools package.
+    At most `max_pending` extractions may be queued or running; further submissions block until
+    a slot frees up, which pushes back on callers producing pages faster than they can be extracted.
+    The `timeout` of a call covers both waiting for a slot and waiting for the result; when it runs
+    out TimeoutError is raised. A page that hangs the extractor keeps its worker busy, but no longer
+    blocks the caller.
+
+    Args:
+        max_workers (int): Number of worker processes
+        max_pending (int, optional): Bound on queued plus running extractions (default: 2 per worker)
+    """
+
+    def __init__(self, max_workers: int = EXTRACTION_WORKERS, max_pending: Optional[int] = None):
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * max_workers)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn avoids forking a process that already runs crawler and Streamlit threads.
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=extraction_worker.warm_up)
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replace the executor, unless another thread already replaced the one that broke."""
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Extraction pool broke, restarting it")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+    def _run(self, html_content: str, timeout: Optional[float]) -> ExtractionResult:
+        submitted = time.perf_counter()
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Extraction queue is full")
+        try:
+            with self._executor_lock:
+                executor = self._executor
+            future = executor.submit(extraction_worker.extract_timed, html_content)
+            remaining = None if timeout is None else max(timeout - (time.perf_counter() - submitted), 0.0)
+            try:
+                content, extraction_ms = future.result(timeout=remaining)
+            except TimeoutError:
+                future.cancel()
+                raise TimeoutError(f"Extraction did not finish within {timeout:.0f}s")
+            except BrokenProcessPool:
+                self._restart(executor)
+                raise
+        finally:
+            self._slots.release()
+        total_ms = (time.perf_counter() - submitted) * 1000
+        return ExtractionResult(content=content, extraction_ms=extraction_ms,
+                                queued_ms=max(total_ms - extraction_ms, 0.0))
+
+    def extract(self, html_content: str, timeout: Optional[float] = None) -> ExtractionResult:
+        """Extract text in a worker process, retrying once on a fresh pool if a worker died."""
+        try:
+            return self._run(html_content, timeout)
+        except BrokenProcessPool:
+            return self._run(html_content, timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def extract_html(html_content: str, url: str = "",
+                 timeout: Optional[float] = EXTRACTION_TIMEOUT_SECONDS) -> ExtractionResult:
+    """
+    Extract clean text from HTML using the shared worker pool and log the per-page extraction time.
+
+    Falls back to extracting on the calling thread when EXTRACTION_WORKERS is 0; `timeout` does
+    not apply there. Pool failures (a worker dying twice, a cancelled or timed-out submission) are
+    raised to the caller.
+    """
+    global _pool
+    if EXTRACTION_WORKERS <= 0:
+        content, extraction_ms = extraction_worker.extract_timed(html_content)
+        result = ExtractionResult(content=content, extraction_ms=extraction_ms, queued_ms=0.0)
+    else:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool()
+        result = _pool.extract(html_content, timeout=timeout)
+    logger.info(f"Extracted {len(result.content or '')} chars from {url or 'page'} "
+                f"in {result.extraction_ms:.0f} ms (queued {result.queued_ms:.0f} ms)")
+    return result
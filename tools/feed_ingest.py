@@ -0,0 +1,271 @@
+import hashlib
+import html
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+
+from .crawler import FetchResult, get_crawler
+from .job_index import FeedState, IndexedJob, JobIndex, get_job_index
+from .extraction_pool import extract_html
+
+logger = logging.getLogger(__name__)
+
+FEEDS_FILE = os.getenv("JOB_FEEDS_FILE", "job_feeds.json")
+DEFAULT_REFRESH_INTERVAL = 6 * 60 * 60
+MAX_SITEMAP_PAGES_PER_REFRESH = 50
+
+GREENHOUSE_URL = "https://boards-api.greenhouse.io/v1/boards/{board}/jobs?content=true"
+LEVER_URL = "https://api.lever.co/v0/postings/{board}?mode=json"
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+Fetcher = Callable[[str, Dict[str, str]], FetchResult]
+
+
+class FeedConfig(BaseModel):
+    type: str  # 'greenhouse', 'lever' or 'sitemap'
+    board: Optional[str] = None  # Greenhouse board token or Lever company slug
+    url: Optional[str] = None  # Sitemap url
+    url_pattern: Optional[str] = None  # Regex a sitemap url must match to be treated as a job page
+    company: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.type}:{self.board or self.url}"
+
+
+def _html_to_text(fragment: str) -> str:
+    return BeautifulSoup(fragment, "html.parser").get_text(separator="\n", strip=True)
+
+
+def _content_hash(*parts: Optional[str]) -> str:
+    return hashlib.sha1("\x00".join(part or "" for part in parts).encode("utf-8")).hexdigest()
+
+
+def parse_greenhouse(payload: dict, feed: FeedConfig) -> List[IndexedJob]:
+    """Parse a Greenhouse job board API response (``/v1/boards/<board>/jobs?content=true``)."""
+    jobs = []
+    for item in payload.get("jobs", []):
+        # Greenhouse returns the description as HTML-escaped HTML.
+        content = _html_to_text(html.unescape(item.get("content") or ""))
+        jobs.append(IndexedJob(
+            job_key=f"{feed.name}:{item['id']}",
+            title=item.get("title") or "",
+            company=feed.company or feed.board,
+            location=(item.get("location") or {}).get("name"),
+            url=item.get("absolute_url") or "",
+            content=content,
+            version=item.get("updated_at") or _content_hash(item.get("title"), content),
+        ))
+    return jobs
+
+
+def parse_lever(payload: list, feed: FeedConfig) -> List[IndexedJob]:
+    """Parse a Lever postings API response (``/v0/postings/<company>?mode=json``)."""
+    jobs = []
+    for item in payload:
+        sections = [item.get("descriptionPlain") or ""]
+        for section in item.get("lists") or []:
+            sections.append(section.get("text") or "")
+            sections.append(_html_to_text(section.get("content") or ""))
+        sections.append(item.get("additionalPlain") or "")
+        content = "\n".join(part for part in sections if part)
+        # Lever has no update timestamp, so a content hash detects edits.
+        jobs.append(IndexedJob(
+            job_key=f"{feed.name}:{item['id']}",
+            title=item.get("text") or "",
+            company=feed.company or feed.board,
+            location=(item.get("categories") or {}).get("location"),
+            url=item.get("hostedUrl") or "",
+            content=content,
+            version=_content_hash(item.get("text"), content),
+        ))
+    return jobs
+
+
+def parse_sitemap(xml_text: str) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
+    """
+    Parse a sitemap or sitemap index.
+
+    Returns:
+        A tuple of (list of (url, lastmod) page entries, list of nested sitemap urls)
+    """
+    root = ET.fromstring(xml_text.encode("utf-8"))
+    pages, sitemaps = [], []
+    for node in root:
+        loc = node.findtext(f"{SITEMAP_NS}loc")
+        if not loc:
+            continue
+        if node.tag == f"{SITEMAP_NS}sitemap":
+            sitemaps.append(loc.strip())
+        elif node.tag == f"{SITEMAP_NS}url":
+            lastmod = node.findtext(f"{SITEMAP_NS}lastmod")
+            pages.append((loc.strip(), lastmod.strip() if lastmod else None))
+    return pages, sitemaps
+
+
+def _page_title(html_content: str) -> str:
+    match = re.search(r"<title[^>]*>(.*?)</title>", html_content, re.IGNORECASE | re.DOTALL)
+    return html.unescape(match.group(1)).strip() if match else ""
+
+
+def _header(result: FetchResult, name: str) -> Optional[str]:
+    return next((value for key, value in result.headers.items() if key.lower() == name.lower()), None)
+
+
+def _default_fetch(url: str, headers: Dict[str, str]) -> FetchResult:
+    # Ingestion runs in the background, so it waits its turn however long the domain's queue is.
+    return get_crawler().fetch(url, headers=headers, max_wait=math.inf)
+
+
+def _refresh_sitemap(feed: FeedConfig, index: JobIndex, fetch: Fetcher) -> Dict[str, int]:
+    pages: List[Tuple[str, Optional[str]]] = []
+    pending, visited = [feed.url], set()
+    while pending:
+        sitemap_url = pending.pop()
+        if sitemap_url in visited:
+            continue
+        visited.add(sitemap_url)
+        result = fetch(sitemap_url, {})
+        if result.status != "success":
+            raise RuntimeError(f"Failed to fetch sitemap {sitemap_url}: {result.error}")
+        found_pages, nested = parse_sitemap(result.html)
+        pages.extend(found_pages)
+        pending.extend(nested)
+
+    if feed.url_pattern:
+        pattern = re.compile(feed.url_pattern)
+        pages = [(url, lastmod) for url, lastmod in pages if pattern.search(url)]
+
+    known = index.job_versions(feed.name)
+    jobs, keep = [], []
+    fetched = 0
+    for url, lastmod in pages:
+        key = f"{feed.name}:{url}"
+        # Only pages that are new or whose lastmod moved are fetched again.
+        if key in known and (lastmod is None or known[key] == lastmod):
+            keep.append(key)
+            continue
+        if fetched >= MAX_SITEMAP_PAGES_PER_REFRESH:
+            # Leave the rest for the next refresh without dropping what is already indexed.
+            if key in known:
+                keep.append(key)
+            continue
+        fetched += 1
+        result = fetch(url, {})
+        content = None
+        if result.status == "success" and result.html:
+            try:
+                content = extract_html(result.html, url=url).content
+            except Exception as e:
+                logger.error(f"Extraction failed for {url}: {e}")
+        if not content:
+            if key in known:
+                keep.append(key)
+            continue
+        jobs.append(IndexedJob(job_key=key, title=_page_title(result.html), company=feed.company,
+                               url=url, content=content, version=lastmod or _content_hash(content)))
+    index.touch_feed(FeedState(feed=feed.name))
+    return index.sync_feed(feed.name, jobs, keep_keys=keep)
+
+
+def refresh_feed(feed: FeedConfig, index: Optional[JobIndex] = None, fetch: Fetcher = _default_fetch) -> Dict[str, int]:
+    """
+    Pull one feed into the local index incrementally.
+
+    JSON boards are requested with If-None-Match/If-Modified-Since so an unchanged board costs a
+    single 304; only postings whose version changed are rewritten and postings that disappeared
+    from the board are removed. `fetch` can be replaced to replay recorded responses offline.
+
+    Returns:
+        Dict[str, int]: Counts of 'upserted' and 'deleted' jobs
+    """
+    index = index or get_job_index()
+    if feed.type == "sitemap":
+        return _refresh_sitemap(feed, index, fetch)
+
+    if feed.type == "greenhouse":
+        url, parser = GREENHOUSE_URL.format(board=feed.board), parse_greenhouse
+    elif feed.type == "lever":
+        url, parser = LEVER_URL.format(board=feed.board), parse_lever
+    else:
+        raise ValueError(f"Unsupported feed type: {feed.type}")
+
+    state = index.feed_state(feed.name)
+    headers = {}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+
+    result = fetch(url, headers)
+    if result.status == "not_modified":
+        index.touch_feed(state)
+        return {"upserted": 0, "deleted": 0}
+    if result.status != "success":
+        raise RuntimeError(f"Failed to fetch feed {feed.name}: {result.error}")
+
+    jobs = parser(json.loads(result.html), feed)
+    counts = index.sync_feed(feed.name, jobs)
+    index.touch_feed(FeedState(feed=feed.name, etag=_header(result, "ETag"),
+                               last_modified=_header(result, "Last-Modified")))
+    return counts
+
+
+def load_feeds(feeds_file: str = FEEDS_FILE) -> List[FeedConfig]:
+    """Load feed definitions from a JSON list, e.g. [{"type": "greenhouse", "board": "stripe"}]."""
+    if not os.path.exists(feeds_file):
+        return []
+    with open(feeds_file, encoding="utf-8") as f:
+        return [FeedConfig(**item) for item in json.load(f)]
+
+
+def refresh_feeds(feeds: Optional[List[FeedConfig]] = None, min_interval: float = DEFAULT_REFRESH_INTERVAL,
+                  index: Optional[JobIndex] = None, fetch: Fetcher = _default_fetch) -> Dict[str, Dict[str, int]]:
+    """Refresh every feed not refreshed within `min_interval` seconds; failures are logged and skipped."""
+    index = index or get_job_index()
+    feeds = load_feeds() if feeds is None else feeds
+    summary = {}
+    for feed in feeds:
+        state = index.feed_state(feed.name)
+        if state.refreshed_at and time.time() - state.refreshed_at < min_interval:
+            continue
+        try:
+            summary[feed.name] = refresh_feed(feed, index, fetch)
+            logger.info(f"Refreshed feed {feed.name}: {summary[feed.name]}")
+        except Exception as e:
+            logger.error(f"Refreshing feed {feed.name} failed: {e}", exc_info=True)
+    return summary
+
+
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_lock = threading.Lock()
+
+
+def start_periodic_refresh(interval: float = DEFAULT_REFRESH_INTERVAL):
+    """Start a daemon thread refreshing the configured feeds every `interval` seconds (once per process)."""
+    global _refresh_thread
+
+    def _loop():
+        while True:
+            refresh_feeds(min_interval=interval)
+            time.sleep(min(interval, 15 * 60))
+
+    with _refresh_lock:
+        if _refresh_thread is not None or not load_feeds():
+            return
+        _refresh_thread = threading.Thread(target=_loop, name="job-feed-refresh", daemon=True)
+        _refresh_thread.start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(refresh_feeds(min_interval=0), indent=2))
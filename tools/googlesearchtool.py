@@ -1,13 +1,17 @@
 import json
+import logging
 
 from langchain_google_community import GoogleSearchAPIWrapper
 from langchain.agents import initialize_agent, Tool, AgentType
 from dotenv import load_dotenv
+
+from .web_scraper import prefetch_pages
 # Step 1: Set up the Google Search API Wrapper
 # Ensure environment variables are set for Google API
 # export GOOGLE_API_KEY='your-api-key'
 # export GOOGLE_CSE_ID='your-cse-id'
 load_dotenv()
+logger = logging.getLogger(__name__)
 google_search_var = GoogleSearchAPIWrapper(k=10)
 
 def google_search(query: str) -> str:
@@ -24,12 +28,11 @@ def google_search(query: str) -> str:
                     Example: "latest Python programming best practices 2024"
 
     Returns:
-        list[dict]: A list of dictionaries containing search results.
+        str: A JSON list of dictionaries containing search results.
         Each dictionary contains:
             - title (str): The title of the search result
+            - link (str): The url of the result
             - snippet (str): A brief excerpt or description of the content
-            - source (str): The source website or domain
-            - date (str, optional): Publication date if available
 
     Notes:
         - The tool returns up to 10 search results per query
@@ -55,18 +58,22 @@ def google_search(query: str) -> str:
     try:
         import time
         time.sleep(2)
-        data_from_search = google_search_var.run(query=query)
-        print(data_from_search)
-        return data_from_search
+        data_from_search = google_search_var.results(query=query, num_results=10)
+        # Start loading the likely picks while the model reads the results.
+        prefetch_pages([item["link"] for item in data_from_search if "link" in item])
+        dumps = json.dumps(data_from_search)
+        logger.debug(dumps)
+        return dumps
     except Exception as e:
 
         e_ = [{"error": f"Search failed: {str(e)}"}]
-        print(e_)
+        logger.error(e_)
         return json.dumps(e_)
 
 
-search = google_search("Java Agentic AI jobs")
-print(search)
+if __name__ == "__main__":
+    search = google_search("Java Agentic AI jobs")
+    print(search)
 #
 # # Step 2: Create a Tool object for Google Search
 # google_search_tool = Tool(
@@ -0,0 +1,280 @@
+import json
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+INDEX_DB_FILE = "tmp/jobs_index.db"
+MAX_RESULT_CONTENT_CHARS = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    feed TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT,
+    location TEXT,
+    url TEXT NOT NULL,
+    content TEXT NOT NULL,
+    version TEXT,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_feed_idx ON jobs(feed);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location, content,
+    content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, location, content)
+    VALUES (new.id, new.title, new.company, new.location, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, content)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company, location, content ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, content)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.content);
+    INSERT INTO jobs_fts(rowid, title, company, location, content)
+    VALUES (new.id, new.title, new.company, new.location, new.content);
+END;
+CREATE TABLE IF NOT EXISTS feeds (
+    feed TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    refreshed_at REAL
+);
+"""
+
+
+class IndexedJob(BaseModel):
+    job_key: str
+    title: str
+    company: Optional[str] = None
+    location: Optional[str] = None
+    url: str
+    content: str
+    # Changes whenever the posting changes (source updated_at, sitemap lastmod or a content hash).
+    version: Optional[str] = None
+
+
+class FeedState(BaseModel):
+    feed: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    refreshed_at: Optional[float] = None
+
+
+class JobIndex:
+    """
+    Local SQLite FTS5 index of job postings pulled from ATS feeds and sitemaps.
+
+    Every call opens its own connection so the index can be shared between the agent thread
+    and the background refresh thread.
+    """
+
+    def __init__(self, db_file: str = INDEX_DB_FILE):
+        self.db_file = db_file
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def feed_state(self, feed: str) -> FeedState:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM feeds WHERE feed = ?", (feed,)).fetchone()
+        return FeedState(**dict(row)) if row else FeedState(feed=feed)
+
+    def job_versions(self, feed: str) -> Dict[str, Optional[str]]:
+        """Returns job_key -> version for every job currently indexed for a feed."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT job_key, version FROM jobs WHERE feed = ?", (feed,)).fetchall()
+        return {row["job_key"]: row["version"] for row in rows}
+
+    def touch_feed(self, state: FeedState):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO feeds(feed, etag, last_modified, refreshed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(feed) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, refreshed_at = excluded.refreshed_at",
+                (state.feed, state.etag, state.last_modified, time.time()),
+            )
+
+    def sync_feed(self, feed: str, jobs: Iterable[IndexedJob], keep_keys: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        Upserts the jobs of one feed and removes jobs that are no longer published.
+
+        Unchanged jobs (same version) are not rewritten, so the full-text index is only touched
+        for postings that actually changed. Jobs whose keys are listed in `keep_keys` are kept
+        even if they are not in `jobs` (e.g. sitemap pages that were not re-fetched).
+
+        Returns:
+            Dict[str, int]: Counts of 'upserted' and 'deleted' jobs
+        """
+        now = time.time()
+        seen = set(keep_keys)
+        upserted = 0
+        with closing(self._connect()) as conn, conn:
+            for job in jobs:
+                seen.add(job.job_key)
+                cursor = conn.execute(
+                    "INSERT INTO jobs(job_key, feed, title, company, location, url, content, version, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(job_key) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                    "location = excluded.location, url = excluded.url, content = excluded.content, "
+                    "version = excluded.version, seen_at = excluded.seen_at "
+                    "WHERE jobs.version IS NOT excluded.version",
+                    (job.job_key, feed, job.title, job.company, job.location, job.url, job.content, job.version, now),
+                )
+                upserted += cursor.rowcount
+            indexed = [row[0] for row in conn.execute("SELECT job_key FROM jobs WHERE feed = ?", (feed,))]
+            stale = [key for key in indexed if key not in seen]
+            conn.executemany("DELETE FROM jobs WHERE job_key = ?", [(key,) for key in stale])
+        return {"upserted": upserted, "deleted": len(stale)}
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Full-text search ranked by BM25; returns dicts shaped like the web search tools' results."""
+        match = _to_fts_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT jobs.title, jobs.url, jobs.company, jobs.location, jobs.content, bm25(jobs_fts) AS rank "
+            "FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+            "WHERE jobs_fts MATCH ? ORDER BY rank LIMIT ?"
+        )
+        with closing(self._connect()) as conn:
+            try:
+                rows = conn.execute(sql, (match, limit)).fetchall()
+            except sqlite3.OperationalError as e:
+                # Fall back to a plain any-word match if the translated boolean query is not valid FTS5.
+                logger.warning(f"FTS query {match!r} failed ({e}), retrying as plain terms")
+                rows = conn.execute(sql, (" OR ".join(_quote_terms(query)), limit)).fetchall()
+        return [
+            {
+                "title": row["title"],
+                "url": row["url"],
+                "content": "\n".join(filter(None, [
+                    " | ".join(filter(None, [row["company"], row["location"]])),
+                    row["content"][:MAX_RESULT_CONTENT_CHARS],
+                ])),
+                "score": -row["rank"],
+            }
+            for row in rows
+        ]
+
+
+_TOKEN_RE = re.compile(r'-?"[^"]*"|[()]|[^\s()]+')
+
+
+def _quote_terms(query: str) -> List[str]:
+    return [f'"{word}"' for word in re.findall(r"\w+", query)]
+
+
+def _phrase(text: str) -> Optional[str]:
+    words = re.findall(r"\w+", text)
+    return '"' + " ".join(words) + '"' if words else None
+
+
+def _to_fts_query(query: str) -> str:
+    """
+    Translates a Google-style boolean query into FTS5 syntax.
+
+    Quoted phrases, OR, parentheses and -exclusions are kept; operators FTS5 does not know
+    (site:, intitle:, ...) are dropped or reduced to their value.
+    """
+    parts: List[str] = []
+    excluded: List[str] = []
+    for token in _TOKEN_RE.findall(query):
+        if token in ("(", ")"):
+            parts.append(token)
+        elif token.upper() in ("OR", "AND"):
+            parts.append(token.upper())
+        elif token.startswith("-") and len(token) > 1:
+            # -"entry level" and -entry-level exclude the whole phrase, not its words separately.
+            phrase = _phrase(token[1:])
+            if phrase:
+                excluded.append(phrase)
+        elif token.startswith('"'):
+            phrase = _phrase(token)
+            if phrase:
+                parts.append(phrase)
+        else:
+            if ":" in token:
+                operator, _, token = token.partition(":")
+                if operator.lower() == "site":
+                    continue
+            parts.extend(_quote_terms(token))
+
+    # Drop dangling operators and unbalanced parentheses the translation may have left behind.
+    while parts and parts[0] in ("OR", "AND", ")"):
+        parts.pop(0)
+    while parts and parts[-1] in ("OR", "AND", "("):
+        parts.pop()
+    if parts.count("(") != parts.count(")"):
+        parts = [part for part in parts if part not in ("(", ")")]
+    if not parts:
+        return ""
+    # FTS5 only allows implicit AND between plain phrases, so spell it out everywhere.
+    joined: List[str] = []
+    for part in parts:
+        if joined and joined[-1] not in ("OR", "AND", "(") and part not in ("OR", "AND", ")"):
+            joined.append("AND")
+        joined.append(part)
+    match = " ".join(joined)
+    if excluded:
+        match = f"({match}) NOT ({' OR '.join(excluded)})"
+    return match
+
+
+_index: Optional[JobIndex] = None
+
+
+def get_job_index() -> JobIndex:
+    global _index
+    if _index is None:
+        _index = JobIndex()
+    return _index
+
+
+def search_local_jobs(query: str, no_of_search_results: int) -> str:
+    """
+    Tool: Local Job Index Search
+
+    Description:
+    Searches the local index of job postings pulled from company career feeds (Greenhouse, Lever)
+    and sitemaps. Answers in milliseconds and costs nothing, so try it before tavily_search or google_search.
+
+    Parameters:
+    - query (str): Keywords or a boolean query, e.g. "senior developer" (java OR python) remote -junior
+    - no_of_search_results (int): Number of search results to return
+
+    Returns:
+    A JSON list of search results, where each result contains:
+    - title: The job title
+    - url: The posting URL
+    - content: Company and location followed by the posting text
+    - score: A relevancy score for the search result (higher is better)
+
+    An empty list means the local index has no match; fall back to the web search tools.
+    """
+    logger.debug(f"local job search query from llm was {query}")
+    try:
+        results = get_job_index().search(query, limit=no_of_search_results)
+        logger.info(f"Local job index returned {len(results)} results")
+        return json.dumps(results)
+    except Exception as e:
+        logger.error(f"Local job search failed: {e}", exc_info=True)
+        return json.dumps([{"error": f"Search failed: {str(e)}"}])
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from pydantic import BaseModel, Field
+
+from .excel_saver_notinuse import JobData
+from .web_scraper import get_page_text
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Rough size heuristics used to pack postings into batches without pulling in a tokenizer.
+CHARS_PER_TOKEN = 4
+DEFAULT_CONTEXT_TOKENS = 128_000
+# Tokens reserved for the instructions, the JSON schema and the model's answer.
+RESERVED_TOKENS = 16_000
+# Approximate output tokens per scored posting; keeps the answer below the model's output limit.
+OUTPUT_TOKENS_PER_POSTING = 250
+MAX_OUTPUT_TOKENS = 16_000
+MAX_POSTING_CHARS = 12_000
+
+scoring_prompt = """
+You are an expert career advisor. You will be given a candidate resume and a numbered list of job postings.
+For EVERY posting, in the same order, return:
+- index: the posting number exactly as given
+- job_title: the job title
+- job_url: the posting url exactly as given
+- country and city of the job if stated, otherwise null
+- relevancy_score: a number between 0 and 1 describing how well the candidate matches the posting
+- recruiter_emails: comma separated recruiter or contact emails if present, otherwise null
+- description: a brief description (at most 2 sentences) of the job
+Do not skip postings and do not invent postings.
+"""
+
+
+class JobPosting(BaseModel):
+    url: str = Field(description="Url where the job was found")
+    title: str = Field(default="", description="Title of the job, if known")
+    content: Optional[str] = Field(default=None, description="Text of the posting; loaded from the page cache if not given")
+
+
+class ScoredJob(JobData):
+    index: int
+
+
+class ScoredJobBatch(BaseModel):
+    jobs: List[ScoredJob]
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _format_posting(index: int, posting: JobPosting) -> str:
+    content = posting.content[:MAX_POSTING_CHARS]
+    return f"## Posting {index}\nTitle: {posting.title}\nUrl: {posting.url}\n{content}\n"
+
+
+def _pack_batches(postings: List[JobPosting], resume: str, context_tokens: int) -> List[List[int]]:
+    """Group posting indexes so every batch fits the context window and the output limit."""
+    budget = context_tokens - RESERVED_TOKENS - _estimate_tokens(resume) - _estimate_tokens(scoring_prompt)
+    if budget <= 0:
+        raise ValueError("Resume is too large to leave room for any job postings in the context window")
+    max_per_batch = max(1, MAX_OUTPUT_TOKENS // OUTPUT_TOKENS_PER_POSTING)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for i, posting in enumerate(postings):
+        cost = _estimate_tokens(_format_posting(i, posting))
+        if current and (used + cost > budget or len(current) >= max_per_batch):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _score_batch(client: AsyncOpenAI, model: str, resume: str, postings: List[JobPosting],
+                       indexes: List[int], semaphore: asyncio.Semaphore) -> List[ScoredJob]:
+    body = "".join(_format_posting(i, postings[i]) for i in indexes)
+    async with semaphore:
+        logger.info(f"Scoring batch of {len(indexes)} postings")
+        completion = await client.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": scoring_prompt},
+                {"role": "user", "content": f"# CANDIDATE RESUME\n{resume}\n\n# JOB POSTINGS\n{body}"},
+            ],
+            response_format=ScoredJobBatch,
+        )
+    parsed = completion.choices[0].message.parsed
+    if parsed is None:
+        raise ValueError(f"Model refused to score batch: {completion.choices[0].message.refusal}")
+    scored = []
+    wanted = set(indexes)
+    for job in parsed.jobs:
+        if job.index not in wanted:
+            continue
+        wanted.discard(job.index)
+        # Never trust the model with the link or a known title: take them from the input posting.
+        posting = postings[job.index]
+        job.job_url = posting.url
+        job.job_title = posting.title or job.job_title
+        job.relevancy_score = min(max(job.relevancy_score, 0.0), 1.0)
+        scored.append(job)
+    return scored
+
+
+async def _load_missing_content(postings: List[JobPosting]) -> List[JobPosting]:
+    """Fill in posting text from the page cache, fetching pages that were never extracted; drops unloadable ones."""
+    async def load(posting: JobPosting) -> Optional[JobPosting]:
+        if posting.content:
+            return posting
+        content = await asyncio.to_thread(get_page_text, posting.url)
+        if not content:
+            logger.warning(f"No content available for {posting.url}, skipping it")
+            return None
+        return posting.model_copy(update={"content": content})
+
+    loaded = await asyncio.gather(*(load(posting) for posting in postings))
+    return [posting for posting in loaded if posting is not None]
+
+
+async def _score_all(client: AsyncOpenAI, resume: str, postings: List[JobPosting], model: str,
+                     context_tokens: int, max_concurrency: int) -> List[JobData]:
+    postings = await _load_missing_content(postings)
+    if not postings:
+        return []
+    batches = _pack_batches(postings, resume, context_tokens)
+    logger.info(f"Scoring {len(postings)} postings in {len(batches)} batches")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(
+        *(_score_batch(client, model, resume, postings, batch, semaphore) for batch in batches),
+        return_exceptions=True,
+    )
+
+    scored = {}
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.error(f"Scoring batch {batch} failed: {result}")
+            continue
+        for job in result:
+            scored[job.index] = job
+    return [JobData(**scored[i].model_dump(exclude={"index"})) for i in sorted(scored)]
+
+
+async def score_jobs_async(resume: str, postings: List[JobPosting], model: str = "gpt-4o",
+                           context_tokens: int = DEFAULT_CONTEXT_TOKENS, max_concurrency: int = 4,
+                           client: Optional[AsyncOpenAI] = None) -> List[JobData]:
+    """
+    Score many job postings against a resume with as few structured-output requests as possible.
+
+    Postings without content are loaded from the page cache filled by extract_content (or fetched
+    if they were never extracted), so callers only need to pass urls. Postings are packed into
+    batches that fit the model's context window and the batches are sent concurrently. A batch
+    that fails is logged and its postings are left out of the result. Urls always come from the
+    input postings, and so do titles when known; scores are clamped to 0..1.
+
+    Args:
+        resume (str): Text of the candidate resume
+        postings (List[JobPosting]): Job postings to score
+        model (str): OpenAI model id supporting structured outputs (default: "gpt-4o")
+        context_tokens (int): Context window size of the model in tokens
+        max_concurrency (int): Maximum number of batches in flight at once
+        client (AsyncOpenAI, optional): Client to use; if not given one is created from the environment and closed afterwards
+
+    Returns:
+        List[JobData]: One scored entry per loadable posting, in the same order as the input postings
+    """
+    if not postings:
+        return []
+    if client is not None:
+        return await _score_all(client, resume, postings, model, context_tokens, max_concurrency)
+    async with AsyncOpenAI() as owned_client:
+        return await _score_all(owned_client, resume, postings, model, context_tokens, max_concurrency)
+
+
+def score_jobs(resume: str, postings: List[JobPosting], **kwargs) -> List[JobData]:
+    """Synchronous wrapper around score_jobs_async for callers without an event loop."""
+    return asyncio.run(score_jobs_async(resume, postings, **kwargs))
+
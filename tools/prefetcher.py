@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "3"))
+PREFETCH_TTL_SECONDS = 300
+MAX_PREFETCH_ENTRIES = 12
+PREFETCH_WORKERS = 4
+
+
+class Prefetcher:
+    """
+    Speculatively runs a page loader for likely-next urls and keeps the results briefly in memory.
+
+    Prefetches go through the same polite per-domain queue as real requests, so at most one url
+    per domain is prefetched at a time: a real request for that domain then waits behind at most
+    one speculative fetch.
+
+    At most `max_entries` prefetches are tracked; when a new one would exceed that, the oldest
+    entries that are not currently running are evicted (cancelled if they have not started).
+    Running prefetches are never evicted, so their work is not thrown away. Entries older than
+    `ttl` seconds are dropped. `take` hands out each result at most once.
+
+    Args:
+        loader (Callable[[str], Any]): Function producing the result for a url
+        top_n (int): Number of urls prefetched per call to `prefetch`
+        ttl (float): Seconds a prefetched result stays usable
+        max_entries (int): Maximum number of prefetches in flight or cached
+    """
+
+    def __init__(self, loader: Callable[[str], Any], top_n: int = PREFETCH_TOP_N,
+                 ttl: float = PREFETCH_TTL_SECONDS, max_entries: int = MAX_PREFETCH_ENTRIES,
+                 max_workers: int = PREFETCH_WORKERS):
+        self.loader = loader
+        self.top_n = top_n
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._entries: "OrderedDict[str, Tuple[Future, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        for url, (future, created_at) in list(self._entries.items()):
+            if now - created_at > self.ttl:
+                future.cancel()
+                del self._entries[url]
+        for url, (future, _) in list(self._entries.items()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if future.running():
+                continue
+            del self._entries[url]
+            if future.cancel():
+                logger.debug(f"Cancelled unused prefetch of {url}")
+
+    def prefetch(self, urls: Iterable[str]):
+        """
+        Start loading the first `top_n` urls in the background.
+
+        Already tracked urls are skipped, as are urls on a domain that already has a prefetch
+        pending or in flight, or that appeared earlier in `urls`.
+        """
+        if self.top_n <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            busy_domains = {urlparse(url).netloc for url, (future, _) in self._entries.items() if not future.done()}
+            started = 0
+            for url in urls:
+                if started >= self.top_n:
+                    break
+                if not url or url in self._entries:
+                    continue
+                domain = urlparse(url).netloc
+                if domain in busy_domains:
+                    continue
+                busy_domains.add(domain)
+                self._entries[url] = (self._executor.submit(self.loader, url), now)
+                started += 1
+            self._evict(now)
+        logger.info(f"Prefetching {started} urls")
+
+    def take(self, url: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Returns the prefetched result for a url, waiting for it if it is still in flight.
+
+        Returns None if the url was not prefetched, expired, was cancelled or failed.
+        """
+        with self._lock:
+            entry = self._entries.pop(url, None)
+        if entry is None:
+            return None
+        future, created_at = entry
+        if time.monotonic() - created_at > self.ttl:
+            future.cancel()
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Prefetch of {url} unusable: {e}")
+            return None
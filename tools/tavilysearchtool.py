@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 from langchain_community.tools import TavilySearchResults
 from pydantic import BaseModel, ConfigDict
 
+from .web_scraper import prefetch_pages
+
 load_dotenv()
 import os
 tavily_api_key = os.getenv("TAVILY_API_KEY")
@@ -56,6 +58,8 @@ def tavily_search(query: str, no_of_search_results: int) -> str:
     ).invoke(query)
     time.sleep(1)
     results_ = [SearchDataFromTool(**item).model_dump() for item in results]
+    # Start loading the likely picks while the model reads the results.
+    prefetch_pages([item["url"] for item in results_])
     dumps = json.dumps(results_)
     logger.debug(dumps)
     return dumps
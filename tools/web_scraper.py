@@ -1,15 +1,21 @@
-import requests
-from bs4 import BeautifulSoup
-import trafilatura
-from typing import Optional
+from typing import List, Optional, Tuple
 import logging
+import threading
+from collections import OrderedDict
 from urllib.parse import urlparse
 logging.basicConfig(level=logging.INFO)
 import json
+from .crawler import FetchResult, get_crawler
+from .extraction_pool import extract_html
+from .prefetcher import Prefetcher
 logger = logging.getLogger(__name__)
-headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+# Recently extracted page texts, so tools like score_and_save_jobs can refer to pages by url
+# instead of having the model repeat their content.
+MAX_CACHED_PAGES = 200
+_page_cache: "OrderedDict[str, str]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+# Fetch outcomes that would come out the same if the page was fetched again right away.
+PERMANENT_FETCH_STATUSES = {"disallowed", "blocked"}
 def __validate_url(url: str) -> bool:
     """Validate if the URL is properly formatted."""
     try:
@@ -19,41 +25,6 @@ def __validate_url(url: str) -> bool:
         logger.error(f"Invalid URL format: {e}")
         return False
 
-def __fetch_page(url: str) -> Optional[str]:
-    """Fetch the webpage content."""
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        logger.error(f"Error fetching page: {e}")
-        return None
-
-def __extract_with_trafilatura(html_content: str) -> Optional[str]:
-    """Extract content using trafilatura library."""
-    try:
-        extracted_text = trafilatura.extract(html_content)
-        return extracted_text
-    except Exception as e:
-        logger.error(f"Trafilatura extraction failed: {e}")
-        return None
-
-def __extract_with_beautifulsoup(html_content: str) -> Optional[str]:
-    """Extract content using BeautifulSoup as fallback."""
-    try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-    
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'header', 'footer', 'nav']):
-            element.decompose()
-    
-        # Get text content
-        text = soup.body.get_text(separator='\n', strip=True) if soup.body else None
-        return text
-    except Exception as e:
-        logger.error(f"BeautifulSoup extraction failed: {e}")
-        return None
-
 def extract_content(url: str) -> str:
     """
     Extracts and processes HTML content from a given URL, removing unnecessary elements
@@ -61,9 +32,15 @@ def extract_content(url: str) -> str:
 
     This function performs the following operations:
     1. Validates the input URL format
-    2. Fetches the webpage content
+    2. Fetches the webpage content through the shared polite crawler (robots.txt, crawl delays,
+       per-domain queues and backoff of hosts answering 403/429/503)
     3. Processes the HTML to remove unwanted elements (scripts, styles, headers, etc.)
-    4. Extracts clean text content
+    4. Extracts clean text content in a warm worker process, off the agent and UI threads
+
+    Pages already extracted, or prefetched in the background after a search (see prefetch_pages),
+    are served from memory instead of being fetched again. A failed prefetch is returned as is
+    when the failure is permanent (HTTP 4xx, disallowed by robots.txt, backed-off host); only
+    transient failures are fetched again.
 
     Args:
         url (str): The complete URL of the webpage to scrape (e.g., 'https://example.com')
@@ -93,41 +70,91 @@ def extract_content(url: str) -> str:
         No exceptions are raised; all errors are handled and returned in the response
     """
     logger.info(f"URL to scrape: {url}")
-    import time
-    time.sleep(2)
+    with _page_cache_lock:
+        content = _page_cache.get(url)
+    if content is not None:
+        logger.info(f"Serving cached content for {url}")
+        return json.dumps({
+            'status': 'success',
+            'content': content,
+            'error': None
+        })
+
+    prefetched = _prefetcher.take(url)
+    if prefetched is not None and not prefetched[1]:
+        logger.info(f"Serving prefetched result for {url}")
+        result = prefetched[0]
+    else:
+        result, _ = __fetch_and_extract(url)
+    parsed = json.loads(result)
+    if parsed['status'] == 'success':
+        __cache_page(url, parsed['content'])
+    return result
+
+def __cache_page(url: str, content: str):
+    with _page_cache_lock:
+        _page_cache[url] = content
+        _page_cache.move_to_end(url)
+        while len(_page_cache) > MAX_CACHED_PAGES:
+            _page_cache.popitem(last=False)
+
+def get_page_text(url: str) -> Optional[str]:
+    """Returns the extracted text of a page, from the cache filled by extract_content or by extracting it now."""
+    return json.loads(extract_content(url))['content']
+
+def __is_transient(fetch_result: FetchResult) -> bool:
+    """Whether fetching the page again could give a different answer."""
+    if fetch_result.status in PERMANENT_FETCH_STATUSES:
+        return False
+    return not (fetch_result.status_code and 400 <= fetch_result.status_code < 500)
+
+def __fetch_and_extract(url: str) -> Tuple[str, bool]:
+    """
+    Fetch and extract a page.
+
+    Returns the JSON response of extract_content and whether a failure is transient, i.e. worth
+    fetching the page again (network errors, 5xx answers, deferred fetches, extraction pool failures).
+    """
     if not __validate_url(url):
         return json.dumps({
             'status': 'error',
             'content': None,
             'error': 'Invalid URL format'
-        })
+        }), False
 
-    html_content = __fetch_page(url)
+    fetch_result = get_crawler().fetch(url)
+    html_content = fetch_result.html
     if not html_content:
         return json.dumps({
             'status': 'error',
             'content': None,
-            'error': 'Failed to fetch page'
-        })
-
-# Try trafilatura first
-    content = __extract_with_trafilatura(html_content)
+            'error': f'Failed to fetch page: {fetch_result.error}'
+        }), __is_transient(fetch_result)
 
-# Fall back to BeautifulSoup if trafilatura fails
-    if not content:
-        content = __extract_with_beautifulsoup(html_content)
-    
+    try:
+        content = extract_html(html_content, url=url).content
+    except Exception as e:
+        logger.error(f"Extraction failed for {url}: {e}")
+        return json.dumps({
+            'status': 'error',
+            'content': None,
+            'error': f'Failed to extract content: {e}'
+        }), True
     if not content:
         return json.dumps({
             'status': 'error',
             'content': None,
             'error': 'Failed to extract content'
-        })
+        }), False
     
     return json.dumps({
         'status': 'success',
         'content': content,
         'error': None
-    })
+    }), False
 
+_prefetcher = Prefetcher(__fetch_and_extract)
 
+def prefetch_pages(urls: List[str]):
+    """Start fetching and extracting the top search result urls while the model decides what to open."""
+    _prefetcher.prefetch(url for url in urls if __validate_url(url))
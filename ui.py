@@ -1,12 +1,17 @@
+import math
 import streamlit as st
 from main import call_agent_and_return_state
 import pandas as pd
 from resume_parser import parse_resume
+from run_history import candidate_id, get_run_history
 import logging
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+HISTORY_PAGE_SIZE = 25
+HISTORY_PERIODS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "All time": None}
+
 def search_jobs():
     # This function will be called when the button is clicked
     resume = st.session_state.resume_text
@@ -17,6 +22,7 @@ def search_jobs():
     logger.debug(f"Instructions: {instructions}")
 
     # Show loading spinner while processing
+    jobs_store = None
     with st.spinner('Searching for jobs...'):
         try:
             # Get the state from your agent
@@ -24,38 +30,27 @@ def search_jobs():
             logger.info("Calling the agent to search for jobs")
             state = call_agent_and_return_state(resume, instructions)
             logger.info("Agent search completed")
-            logger.debug(f"Agent session state received: {state}")
+            logger.debug(f"Agent session state keys received: {list(state)}")
 
             # Debug information
             # st.write(f"Agent session state received: {state}")
 
-            # Check if jobs_list exists and has items
-            if "jobs_list" not in state or not state["jobs_list"]:
-                logger.warning("No jobs were saved by the agent. The jobs_list is empty.")
-                st.warning("No jobs were saved by the agent. The jobs_list is empty.")
+            # Check if the run's job store exists and has items
+            jobs_store = state.get("jobs_store")
+            if jobs_store is None or len(jobs_store) == 0:
+                logger.warning("No jobs were saved by the agent. The job store is empty.")
+                st.warning("No jobs were saved by the agent. The job store is empty.")
                 st.write("This could be because:")
                 st.write("1. The agent couldn't find any matching jobs")
                 st.write("2. The agent encountered an error when trying to save jobs")
                 st.write("3. The agent didn't properly use the save_found_jobs tool")
                 return
 
-            # Create dictionary with only required fields
-            jobs_data = {
-                'title': [],
-                'description': [],
-                'url': []
-            }
-
-            # Populate the dictionary with job data from state
-            logger.info(f"Processing {len(state['jobs_list'])} jobs from agent results")
-            for i, job in enumerate(state["jobs_list"]):
-                jobs_data['title'].append(job["title"])
-                jobs_data['description'].append(job["description"])
-                jobs_data['url'].append(job["url"])
-                logger.debug(f"Processed job {i+1}: {job['title']}")
-
-            # Create dataframe
-            df = pd.DataFrame(jobs_data)
+            logger.info(f"Processing {jobs_store.summary()} from agent results")
+
+            # Create dataframe straight from the store's columns
+            df = pd.DataFrame(jobs_store.columns())
+            df["saved_at"] = pd.to_datetime(df["saved_at"], unit="s")
             logger.info(f"Created dataframe with {len(df)} jobs")
 
             # Show total number of jobs found
@@ -76,6 +71,16 @@ def search_jobs():
                     "url": st.column_config.LinkColumn(
                         "Apply Link",
                         width="small",
+                    ),
+                    "relevancy_score": st.column_config.NumberColumn(
+                        "Relevancy",
+                        format="%.2f",
+                        width="small",
+                    ),
+                    "saved_at": st.column_config.DatetimeColumn(
+                        "Saved",
+                        format="YYYY-MM-DD HH:mm",
+                        width="small",
                     )
                 },
                 hide_index=True,
@@ -112,6 +117,10 @@ def search_jobs():
             st.write("2. Make sure your search instructions are clear and specific")
             st.write("3. Try again with a different search query")
             return
+        finally:
+            # The jobs are in the dataframe now; drop the run's spill file
+            if jobs_store is not None:
+                jobs_store.close()
 
         if 'df' in locals() and df.empty:
             logger.warning("Empty dataframe returned - no jobs found matching criteria")
@@ -120,6 +129,79 @@ def search_jobs():
     logger.info("Job search process completed")
     st.write(f"Done!")
 
+def show_history():
+    # Only the requested page is read from the run history database
+    st.subheader("Saved Jobs")
+    history = get_run_history()
+    resume = st.session_state.resume_text
+
+    period_col, resume_col = st.columns(2)
+    period = period_col.selectbox("Period", list(HISTORY_PERIODS), index=1, key="history_period")
+    only_resume = resume_col.checkbox("Only jobs for the current resume",
+                                      value=bool(resume),
+                                      disabled=not resume,
+                                      key="history_only_resume")
+    candidate = candidate_id(resume) if only_resume and resume else None
+    since_days = HISTORY_PERIODS[period]
+
+    total = history.count_jobs(candidate=candidate, since_days=since_days)
+    logger.debug(f"History has {total} jobs for period '{period}'")
+    if total == 0:
+        st.info("No saved jobs for this period yet.")
+    else:
+        pages = math.ceil(total / HISTORY_PAGE_SIZE)
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key="history_page")
+        jobs = history.query_jobs(candidate=candidate, since_days=since_days,
+                                  limit=HISTORY_PAGE_SIZE, offset=(page - 1) * HISTORY_PAGE_SIZE)
+        df = pd.DataFrame(jobs)
+        df["saved_at"] = pd.to_datetime(df["saved_at"], unit="s")
+        st.caption(f"Showing {len(df)} of {total} jobs (page {page} of {pages})")
+        st.dataframe(
+            df[["saved_at", "title", "description", "url", "relevancy_score"]],
+            column_config={
+                "saved_at": st.column_config.DatetimeColumn("Saved", format="YYYY-MM-DD HH:mm"),
+                "title": st.column_config.TextColumn("Job Title", width="medium"),
+                "description": st.column_config.TextColumn("Description", width="large"),
+                "url": st.column_config.LinkColumn("Apply Link", width="small"),
+                "relevancy_score": st.column_config.NumberColumn("Relevancy", format="%.2f", width="small"),
+            },
+            hide_index=True,
+        )
+
+    st.subheader("Recent Runs")
+    runs = history.list_runs(candidate=candidate, limit=20)
+    if not runs:
+        st.info("No runs recorded yet.")
+        return
+
+    runs_df = pd.DataFrame(runs)
+    runs_df["started_at"] = pd.to_datetime(runs_df["started_at"], unit="s")
+    runs_df["queries"] = runs_df["queries"].apply("; ".join)
+    st.dataframe(
+        runs_df[["started_at", "status", "job_count", "duration_s", "total_tokens", "queries", "instructions"]],
+        column_config={
+            "started_at": st.column_config.DatetimeColumn("Started", format="YYYY-MM-DD HH:mm"),
+            "duration_s": st.column_config.NumberColumn("Duration (s)", format="%.0f"),
+        },
+        hide_index=True,
+    )
+
+    if len(runs) < 2:
+        return
+
+    st.subheader("Compare Runs")
+    labels = {run["run_id"]: f"{pd.to_datetime(run['started_at'], unit='s'):%Y-%m-%d %H:%M} "
+                             f"({run['job_count']} jobs)"
+              for run in runs}
+    older_col, newer_col = st.columns(2)
+    run_a = older_col.selectbox("Older run", list(labels), index=1, format_func=labels.get, key="compare_run_a")
+    run_b = newer_col.selectbox("Newer run", list(labels), index=0, format_func=labels.get, key="compare_run_b")
+    diff = history.compare_runs(run_a, run_b)
+    st.write(f"{len(diff['only_b'])} new jobs, {len(diff['only_a'])} no longer found, "
+             f"{len(diff['both'])} found in both runs")
+    if diff["only_b"]:
+        st.dataframe(pd.DataFrame(diff["only_b"]), hide_index=True)
+
 def main():
     # Set page configuration
     logger.info("Starting Job Search UI application")
@@ -137,8 +219,10 @@ def main():
         logger.debug("Initializing resume_text in session state")
         st.session_state.resume_text = ""
 
+    search_tab, history_tab = st.tabs(["Search", "History"])
+
     # Create a form-like container
-    with st.container():
+    with search_tab:
         # File uploader for resume
         st.subheader("Upload Your Resume")
         uploaded_file = st.file_uploader("Choose a file", type=["pdf", "docx", "txt"])
@@ -181,6 +265,9 @@ def main():
             logger.info("Search button clicked")
             search_jobs()
 
+    with history_tab:
+        show_history()
+
 if __name__ == "__main__":
     logger.info("Starting Job Search application")
     main()